@@ -1,69 +1,158 @@
 import logging
 from collections.abc import Iterable
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from docling_core.types.doc import BoundingBox, CoordOrigin
+import numpy as np
+from docling_core.types.doc import CoordOrigin, Size
+from docling_core.types.doc.page import TextCell
 from docling_core.types.legacy_doc.base import BaseCell, BaseText, Ref, Table
 
 from docling.datamodel.document import ConversionResult, Page
 
 _log = logging.getLogger(__name__)
 
+_LABEL_TO_DOCLAYNET = {
+    "title": "title",
+    "table-of-contents": "document_index",
+    "subtitle-level-1": "section_header",
+    "checkbox-selected": "checkbox_selected",
+    "checkbox-unselected": "checkbox_unselected",
+    "caption": "caption",
+    "page-header": "page_header",
+    "page-footer": "page_footer",
+    "footnote": "footnote",
+    "table": "table",
+    "formula": "formula",
+    "list-item": "list_item",
+    "code": "code",
+    "figure": "picture",
+    "picture": "picture",
+    "reference": "text",
+    "paragraph": "text",
+    "text": "text",
+}
+_KNOWN_OBJ_TYPES = frozenset(_LABEL_TO_DOCLAYNET)
+
+# Below this number of cells the NumPy setup costs more than it saves
+_MIN_VECTORIZED_CELLS = 4
+
+
+def _normalization_scales(page_size: Size) -> Tuple[float, float]:
+    """Factors mapping page coordinates to the unit page."""
+    # Same scale factors as BoundingBox.normalized(), to keep identical results
+    return 1.0 / page_size.width, 1.0 / page_size.height
+
+
+def _normalized_cell_bboxes(
+    cells: Sequence[TextCell], page_size: Size
+) -> List[Tuple[float, float, float, float]]:
+    """Top-left origin, page-normalized (l, t, r, b) bboxes of the cells' rects."""
+    if len(cells) < _MIN_VECTORIZED_CELLS:
+        return [
+            cell.rect.to_bounding_box()
+            .to_top_left_origin(page_height=page_size.height)
+            .normalized(page_size=page_size)
+            .as_tuple()
+            for cell in cells
+        ]
+
+    corners = np.fromiter(
+        (
+            coord
+            for cell in cells
+            for coord in (
+                cell.rect.r_x0,
+                cell.rect.r_x1,
+                cell.rect.r_x2,
+                cell.rect.r_x3,
+                cell.rect.r_y0,
+                cell.rect.r_y1,
+                cell.rect.r_y2,
+                cell.rect.r_y3,
+            )
+        ),
+        dtype=np.float64,
+        count=8 * len(cells),
+    ).reshape(-1, 8)
+    bottom_left = np.fromiter(
+        (cell.rect.coord_origin == CoordOrigin.BOTTOMLEFT for cell in cells),
+        dtype=bool,
+        count=len(cells),
+    )
+    xs = corners[:, :4]
+    ys = corners[:, 4:]
+    y_min = ys.min(axis=1)
+    y_max = ys.max(axis=1)
+    x_scale, y_scale = _normalization_scales(page_size)
+
+    bboxes = np.empty((len(cells), 4), dtype=np.float64)
+    bboxes[:, 0] = xs.min(axis=1)
+    bboxes[:, 1] = np.where(bottom_left, page_size.height - y_max, y_min)
+    bboxes[:, 2] = xs.max(axis=1)
+    bboxes[:, 3] = np.where(bottom_left, page_size.height - y_min, y_max)
+    bboxes[:, 0::2] *= x_scale
+    bboxes[:, 1::2] *= y_scale
+
+    return [(left, top, right, bottom) for left, top, right, bottom in bboxes.tolist()]
+
+
+def _normalized_prov_bboxes(
+    prov_bboxes: Sequence[Sequence[float]], page_size: Size
+) -> List[Tuple[float, float, float, float]]:
+    """Top-left origin, page-normalized (l, t, r, b) bboxes of legacy prov bboxes.
+
+    Legacy prov bboxes are (l, b, r, t) tuples in bottom-left origin.
+    """
+    page_height = page_size.height
+    x_scale, y_scale = _normalization_scales(page_size)
+
+    bboxes = []
+    for left, bottom, right, top in prov_bboxes:
+        if right < left:
+            left, right = right, left
+        if bottom > top:
+            bottom, top = top, bottom
+        bboxes.append(
+            (
+                left * x_scale,
+                (page_height - top) * y_scale,
+                right * x_scale,
+                (page_height - bottom) * y_scale,
+            )
+        )
+    return bboxes
+
 
 def generate_multimodal_pages(
     doc_result: ConversionResult,
 ) -> Iterable[Tuple[str, str, List[Dict[str, Any]], List[Dict[str, Any]], Page]]:
-    label_to_doclaynet = {
-        "title": "title",
-        "table-of-contents": "document_index",
-        "subtitle-level-1": "section_header",
-        "checkbox-selected": "checkbox_selected",
-        "checkbox-unselected": "checkbox_unselected",
-        "caption": "caption",
-        "page-header": "page_header",
-        "page-footer": "page_footer",
-        "footnote": "footnote",
-        "table": "table",
-        "formula": "formula",
-        "list-item": "list_item",
-        "code": "code",
-        "figure": "picture",
-        "picture": "picture",
-        "reference": "text",
-        "paragraph": "text",
-        "text": "text",
-    }
-
-    content_text = ""
-    page_no = 0
-    start_ix = 0
-    end_ix = 0
-    doc_items: List[Tuple[int, Union[BaseCell, BaseText]]] = []
-
     doc = doc_result.legacy_document
 
     def _process_page_segments(doc_items: list[Tuple[int, BaseCell]], page: Page):
-        segments = []
+        segments: List[dict] = []
+        if page.size is None:
+            return segments
 
+        labeled_items = []
         for ix, item in doc_items:
             item_type = item.obj_type
-            label = label_to_doclaynet.get(item_type, None)
-
-            if label is None or item.prov is None or page.size is None:
+            if item_type not in _KNOWN_OBJ_TYPES or item.prov is None:
                 continue
 
-            bbox = BoundingBox.from_tuple(
-                tuple(item.prov[0].bbox), origin=CoordOrigin.BOTTOMLEFT
-            )
-            new_bbox = bbox.to_top_left_origin(page_height=page.size.height).normalized(
-                page_size=page.size
+            labeled_items.append(
+                (ix, item, _LABEL_TO_DOCLAYNET[item_type], item.prov[0].bbox)
             )
 
-            new_segment = {
+        bboxes = _normalized_prov_bboxes(
+            [prov_bbox for *_, prov_bbox in labeled_items], page_size=page.size
+        )
+
+        for (ix, item, label, _), bbox in zip(labeled_items, bboxes):
+            new_segment: Dict[str, Any] = {
                 "index_in_doc": ix,
                 "label": label,
                 "text": item.text if item.text is not None else "",
-                "bbox": new_bbox.as_tuple(),
+                "bbox": bbox,
                 "data": [],
             }
 
@@ -84,25 +173,28 @@ def generate_multimodal_pages(
         cells: List[dict] = []
         if page.size is None:
             return cells
-        for cell in page.cells:
-            new_bbox = (
-                cell.rect.to_bounding_box()
-                .to_top_left_origin(page_height=page.size.height)
-                .normalized(page_size=page.size)
-            )
+        page_cells = page.cells
+        bboxes = _normalized_cell_bboxes(page_cells, page_size=page.size)
+        for cell, bbox in zip(page_cells, bboxes):
             is_ocr = cell.from_ocr
             ocr_confidence = cell.confidence
             cells.append(
                 {
                     "text": cell.text,
-                    "bbox": new_bbox.as_tuple(),
+                    "bbox": bbox,
                     "ocr": is_ocr,
                     "ocr_confidence": ocr_confidence,
                 }
             )
         return cells
 
-    def _process_page():
+    def _process_page(
+        page_no: int,
+        start_ix: int,
+        end_ix: int,
+        doc_items: List[Tuple[int, Union[BaseCell, BaseText]]],
+        content_text_parts: List[str],
+    ):
         page_ix = page_no - 1
         page = doc_result.pages[page_ix]
 
@@ -116,31 +208,54 @@ def generate_multimodal_pages(
             main_text_start=start_ix, main_text_stop=end_ix, add_page_index=False
         )
 
+        # Each non-empty item text is followed by a single space
+        content_text = " ".join(content_text_parts) + " " if content_text_parts else ""
+
         return content_text, content_md, content_dt, page_cells, page_segments, page
 
     if doc.main_text is None:
         return
+
+    # Parallel lists over the main_text items which have a provenance
+    indices: List[int] = []
+    pages: List[int] = []
+    texts: List[Optional[str]] = []
+    items: List[Union[BaseCell, BaseText]] = []
+
+    _resolve_ref = doc._resolve_ref
     for ix, orig_item in enumerate(doc.main_text):
-        item = doc._resolve_ref(orig_item) if isinstance(orig_item, Ref) else orig_item
+        item = _resolve_ref(orig_item) if isinstance(orig_item, Ref) else orig_item
         if item is None or item.prov is None or len(item.prov) == 0:
             _log.debug(f"Skipping item {orig_item}")
             continue
 
-        item_page = item.prov[0].page
+        indices.append(ix)
+        pages.append(item.prov[0].page)
+        texts.append(item.text)
+        items.append(item)
 
-        # Page is complete
-        if page_no > 0 and item_page > page_no:
-            yield _process_page()
-
-            start_ix = ix
-            doc_items = []
-            content_text = ""
+    if len(items) == 0:
+        return
 
-        page_no = item_page
-        end_ix = ix
-        doc_items.append((ix, item))
-        if item.text is not None and item.text != "":
-            content_text += item.text + " "
+    # A page is complete when the next item is on a later page
+    page_starts = [0] + [
+        pos
+        for pos in range(1, len(pages))
+        if pages[pos - 1] > 0 and pages[pos] > pages[pos - 1]
+    ]
+    page_ends = [*page_starts[1:], len(pages)]
 
-    if len(doc_items) > 0:
-        yield _process_page()
+    for page_start, page_end in zip(page_starts, page_ends):
+        yield _process_page(
+            page_no=pages[page_end - 1],
+            start_ix=indices[page_start] if page_start > 0 else 0,
+            end_ix=indices[page_end - 1],
+            doc_items=list(
+                zip(indices[page_start:page_end], items[page_start:page_end])
+            ),
+            content_text_parts=[
+                text
+                for text in texts[page_start:page_end]
+                if text is not None and text != ""
+            ],
+        )
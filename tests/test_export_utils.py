@@ -0,0 +1,170 @@
+import random
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from docling_core.types.doc import BoundingBox, CoordOrigin, Size
+from docling_core.types.doc.page import BoundingRectangle, TextCell
+from docling_core.types.legacy_doc.base import (
+    BaseText,
+    Figure,
+    PageDimensions,
+    Prov,
+    Ref,
+)
+from docling_core.types.legacy_doc.document import (
+    CCSDocumentDescription,
+    CCSFileInfoObject,
+    ExportedCCSDocument,
+)
+
+from docling.datamodel.base_models import Page
+from docling.utils.export import (
+    _MIN_VECTORIZED_CELLS,
+    _normalized_cell_bboxes,
+    _normalized_prov_bboxes,
+    generate_multimodal_pages,
+)
+
+PAGE_SIZE = Size(width=612.3, height=791.7)
+
+
+def _random_cells(num_cells: int, coord_origin: CoordOrigin) -> List[TextCell]:
+    rng = random.Random(num_cells)
+    cells = []
+    for _ in range(num_cells):
+        xs = [rng.uniform(0, PAGE_SIZE.width) for _ in range(4)]
+        ys = [rng.uniform(0, PAGE_SIZE.height) for _ in range(4)]
+        rect = BoundingRectangle(
+            r_x0=xs[0],
+            r_y0=ys[0],
+            r_x1=xs[1],
+            r_y1=ys[1],
+            r_x2=xs[2],
+            r_y2=ys[2],
+            r_x3=xs[3],
+            r_y3=ys[3],
+            coord_origin=coord_origin,
+        )
+        cells.append(TextCell(rect=rect, text="x", orig="x", from_ocr=False))
+    return cells
+
+
+@pytest.mark.parametrize(
+    "num_cells", [0, 1, _MIN_VECTORIZED_CELLS - 1, _MIN_VECTORIZED_CELLS, 500]
+)
+@pytest.mark.parametrize("coord_origin", [CoordOrigin.BOTTOMLEFT, CoordOrigin.TOPLEFT])
+def test_normalized_cell_bboxes(num_cells: int, coord_origin: CoordOrigin):
+    cells = _random_cells(num_cells, coord_origin)
+    expected = [
+        cell.rect.to_bounding_box()
+        .to_top_left_origin(page_height=PAGE_SIZE.height)
+        .normalized(page_size=PAGE_SIZE)
+        .as_tuple()
+        for cell in cells
+    ]
+
+    assert _normalized_cell_bboxes(cells, page_size=PAGE_SIZE) == expected
+
+
+def test_normalized_cell_bboxes_mixed_origins():
+    cells = _random_cells(
+        _MIN_VECTORIZED_CELLS, CoordOrigin.BOTTOMLEFT
+    ) + _random_cells(_MIN_VECTORIZED_CELLS, CoordOrigin.TOPLEFT)
+    expected = [
+        cell.rect.to_bounding_box()
+        .to_top_left_origin(page_height=PAGE_SIZE.height)
+        .normalized(page_size=PAGE_SIZE)
+        .as_tuple()
+        for cell in cells
+    ]
+
+    assert _normalized_cell_bboxes(cells, page_size=PAGE_SIZE) == expected
+
+
+@pytest.mark.parametrize("num_bboxes", [0, 1, 500])
+def test_normalized_prov_bboxes(num_bboxes: int):
+    rng = random.Random(num_bboxes)
+    # Legacy (l, b, r, t) bboxes, with some corners given in the wrong order
+    prov_bboxes = [
+        [rng.uniform(0, PAGE_SIZE.width), rng.uniform(0, PAGE_SIZE.height)] * 2
+        for _ in range(num_bboxes)
+    ]
+    for prov_bbox in prov_bboxes:
+        prov_bbox[2] += rng.uniform(-100, 100)
+        prov_bbox[3] += rng.uniform(-100, 100)
+    expected = [
+        BoundingBox.from_tuple(tuple(prov_bbox), origin=CoordOrigin.BOTTOMLEFT)
+        .to_top_left_origin(page_height=PAGE_SIZE.height)
+        .normalized(page_size=PAGE_SIZE)
+        .as_tuple()
+        for prov_bbox in prov_bboxes
+    ]
+
+    assert _normalized_prov_bboxes(prov_bboxes, page_size=PAGE_SIZE) == expected
+
+
+def _legacy_text(text: str, page: int, with_prov: bool = True) -> BaseText:
+    return BaseText(
+        text=text,
+        obj_type="paragraph",
+        name="Text",
+        prov=[Prov(bbox=[10, 20, 50, 40], page=page, span=[0, len(text)])]
+        if with_prov
+        else [],
+    )
+
+
+def test_generate_multimodal_pages_page_splitting():
+    legacy_doc = ExportedCCSDocument(
+        name="test",
+        description=CCSDocumentDescription(logs=[]),
+        file_info=CCSFileInfoObject(filename="test.pdf", document_hash="0"),
+        main_text=[
+            _legacy_text("Preamble", page=1, with_prov=False),
+            _legacy_text("First page", page=1),
+            # Does not resolve, since the document has no equations
+            Ref(name="Formula", obj_type="equation", ref="#/equations/0"),
+            _legacy_text("Second page", page=2),
+            Ref(name="Picture", obj_type="figure", ref="#/figures/0"),
+            # A decreasing page number does not start a new page
+            _legacy_text("Back on one", page=1),
+            _legacy_text("Third page", page=3),
+            _legacy_text("Trailer", page=3, with_prov=False),
+        ],
+        figures=[
+            Figure(
+                text="",
+                obj_type="figure",
+                prov=[Prov(bbox=[10, 50, 90, 150], page=2, span=[0, 0])],
+            )
+        ],
+        page_dimensions=[
+            PageDimensions(page=page, width=100, height=200) for page in range(1, 4)
+        ],
+    )
+    pages = [
+        Page(page_no=page_no, size=Size(width=100, height=200)) for page_no in range(3)
+    ]
+    doc_result = SimpleNamespace(legacy_document=legacy_doc, pages=pages)
+
+    results = list(generate_multimodal_pages(doc_result))
+
+    # Each page is taken from the page number of its last item
+    assert [page for *_, page in results] == [pages[0], pages[0], pages[2]]
+    assert [content_text for content_text, *_ in results] == [
+        "First page ",
+        "Second page Back on one ",
+        "Third page ",
+    ]
+    assert [
+        [segment["index_in_doc"] for segment in segments] for *_, segments, _ in results
+    ] == [[1], [3, 4, 5], [6]]
+    # The first page starts at the beginning of main_text, even without prov
+    assert [content_md for _, content_md, *_ in results] == [
+        legacy_doc.export_to_markdown(main_text_start=0, main_text_stop=1),
+        legacy_doc.export_to_markdown(main_text_start=3, main_text_stop=5),
+        legacy_doc.export_to_markdown(main_text_start=6, main_text_stop=6),
+    ]
+    assert "Preamble" in results[0][1]
+    assert results[1][4][1]["bbox"] == (0.1, 0.25, 0.9, 0.75)